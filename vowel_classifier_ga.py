@@ -1,15 +1,25 @@
+import hashlib
+import json
+import multiprocessing
 import os
-import random
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import numpy as np
-import librosa
 import scipy.io
+from scipy.optimize import OptimizeWarning, curve_fit
+from scipy.signal import resample_poly
 from scipy.signal.windows import hann
 from sklearn.model_selection import train_test_split
 
+try:
+    import numba
+except ImportError:  # optional, only speeds up the training-data augmentation
+    numba = None
+
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from torch.utils.data import DataLoader, TensorDataset
 
 
 # hyper-parameters
@@ -21,12 +31,68 @@ population_size = 20
 num_generations = 4
 num_parents = 5
 
+# train on the GPU when one is available; the whole dataset is kept on the device, and losses and
+# accuracies are accumulated there and only read back once per epoch, so the host never stalls the GPU
+device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+# fuse each network's layers into compiled kernels with torch.compile; compiling costs a few
+# seconds per model, which the kernel-launch savings only repay on the GPU
+COMPILE_MODELS = device.type == "cuda"
+
+# replay each training step as a captured CUDA graph, removing the per-kernel launch latency that
+# dominates the small networks searched here; opt-in with GA_CUDA_GRAPHS=1 until validated on a GPU, and
+# only ever used when training on CUDA
+CUDA_GRAPHS = os.environ.get("GA_CUDA_GRAPHS") == "1" and device.type == "cuda"
+
+# genomes trained at once: in worker processes on the CPU, and on the GPU in threads that each issue their
+# work on their own CUDA stream, so the small kernels of different genomes overlap on the device
+FITNESS_WORKERS = 4 if device.type == "cuda" else min(4, os.cpu_count() or 1)
+
+# Fitness of every genome evaluated so far, keyed by `genome_key`. Parents carried over into the
+# next generation, and children identical to an earlier genome, are not re-trained.
+fitness_cache = {}
+
+# bump whenever the preprocessing changes so stale on-disk caches are not reused
+PCVC_CACHE_VERSION = 3
 
-def load_and_process_pcvc_data(directory=".", train_size=0.8, random_seed=42):
+
+if numba is not None:
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def window_slices(src, window, starts, out):
+        """
+        Cuts windowed slices out of the rows of `src` in one fused, parallel pass.
+
+        Row `i` of `out` receives `src[i % len(src), starts[i]:starts[i] + len(window)] * window`, so `starts`
+        laid out replica-major yields the same block as gathering the slices with fancy-indexing and then
+        multiplying, without the intermediate gather.
+
+        Parameters:
+        - src (np.array): (N, nsamps) signals to slice.
+        - window (np.array): The window function applied to every slice.
+        - starts (np.array): The start offset of every output row.
+        - out (np.array): (len(starts), len(window)) output buffer, written in place.
+        """
+        n_rows = src.shape[0]
+        for i in numba.prange(starts.shape[0]):
+            row, start = i % n_rows, starts[i]
+            for k in range(window.shape[0]):
+                out[i, k] = src[row, start + k] * window[k]
+
+else:
+    window_slices = None
+
+
+def load_and_process_pcvc_data(
+    directory=".", train_size=0.8, random_seed=42, use_cache=True
+):
     """
     Load, process, and split the PCVC dataset from .mat files into training and validation sets,
     with randomized window slicing for the training data to expand the dataset size.
 
+    The processed arrays are cached as .npy files in a `pcvc_cache_<key>` sub-directory of `directory`,
+    keyed on the arguments below, and memory-mapped back on subsequent calls instead of being recomputed.
+
     Instructions for data preparation:
     1. Visit the Kaggle dataset page at https://www.kaggle.com/sabermalek/pcvcspeech
     2. Download the dataset by clicking on the 'Download' button.
@@ -37,14 +103,29 @@ def load_and_process_pcvc_data(directory=".", train_size=0.8, random_seed=42):
     - directory: str, the directory where .mat files are located (default is the current directory).
     - train_size: float, the proportion of the dataset to include in the train split.
     - random_seed: int, the seed used for random operations to ensure reproducibility.
+    - use_cache: bool, whether to read/write the processed arrays from/to the on-disk cache.
 
     Returns:
-    - tr_data: np.array, training dataset.
-    - tr_labels: np.array, training labels.
-    - vl_data: np.array, validation dataset.
-    - vl_labels: np.array, validation labels.
+    - tr_data: np.array (float32), training dataset.
+    - tr_labels: np.array (int64), training class indices.
+    - vl_data: np.array (float32), validation dataset.
+    - vl_labels: np.array (int64), validation class indices.
     """
 
+    # Reuse previously processed arrays if present (copy-on-write memory maps)
+    cache_names = ("tr_data", "tr_labels", "vl_data", "vl_labels")
+    cache_key = hashlib.md5(
+        repr(
+            (os.path.abspath(directory), train_size, random_seed, PCVC_CACHE_VERSION)
+        ).encode()
+    ).hexdigest()[:12]
+    cache_dir = os.path.join(directory, f"pcvc_cache_{cache_key}")
+    if use_cache and os.path.isdir(cache_dir):
+        return tuple(
+            np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode="c")
+            for name in cache_names
+        )
+
     # List all .mat files in the specified directory
     all_mats = [file for file in os.listdir(directory) if file.endswith(".mat")]
     raw_data = []
@@ -54,6 +135,8 @@ def load_and_process_pcvc_data(directory=".", train_size=0.8, random_seed=42):
     for _, mat_file in enumerate(all_mats):
         mat_path = os.path.join(directory, mat_file)
         mat_data = np.squeeze(scipy.io.loadmat(mat_path)["x"])
+        # keep the whole pipeline in float32, the dtype the network trains in
+        mat_data = mat_data.astype(np.float32, copy=False)
         raw_data.append(mat_data)
         labels.append(
             np.repeat(np.arange(num_vowels)[np.newaxis], mat_data.shape[0], axis=0)
@@ -76,33 +159,60 @@ def load_and_process_pcvc_data(directory=".", train_size=0.8, random_seed=42):
 
     # Define window size and function
     window_size = 10000
-    window = hann(window_size)
-
-    # Process Training Data with random slicing
-    tr_data_processed = []
-    tr_labels_processed = []
-    for j in range(10):  # repeat the tr data 10 times
-        for i, d in enumerate(tr_data):
-            start = np.random.randint(0, nsamps - window_size)
-            end = start + window_size
-            sliced = d[start:end] * window
-            resampled = librosa.resample(sliced, orig_sr=48000, target_sr=16000)
-            tr_data_processed.append(resampled)
-            tr_labels_processed.append(tr_labels[i])
-    tr_data = np.array(tr_data_processed)
-    tr_labels = np.array(tr_labels_processed)
+    window = hann(window_size).astype(np.float32)
+
+    # Process Training Data with random slicing (repeat the tr data 10 times).
+    # All window offsets are drawn up front; the output is a preallocated (10 * N, ...) block ordered
+    # replica-major. Each replica is windowed into one reused (N, window_size) buffer and resampled into
+    # its slice of the output, so the windowed slices of only one replica are held in memory at a time.
+    n_repeats, n_train = 10, tr_data.shape[0]
+    rng = np.random.default_rng(random_seed)
+    starts = rng.integers(0, nsamps - window_size, size=(n_repeats, n_train))
+    # 48 kHz -> 16 kHz is an exact 3:1 decimation, giving ceil(window_size / 3) samples per slice
+    tr_processed = np.empty((n_repeats * n_train, -(-window_size // 3)), dtype=np.float32)
+    sliced = np.empty((n_train, window_size), dtype=tr_data.dtype)
+    for j in range(n_repeats):
+        if window_slices is not None:
+            # Fused, parallel slice-and-window kernel
+            window_slices(tr_data, window, starts[j], sliced)
+        else:
+            idx = starts[j, :, np.newaxis] + np.arange(window_size)
+            np.multiply(np.take_along_axis(tr_data, idx, axis=1), window, out=sliced)
+        tr_processed[j * n_train : (j + 1) * n_train] = resample_poly(
+            sliced, up=1, down=3, axis=1
+        )
+    tr_data = tr_processed
+    tr_labels = np.tile(tr_labels, n_repeats)
 
     # Process Validation Data with fixed slicing
     vl_data = vl_data[:, 5000:15000] * window
-    vl_data = np.array(
-        [librosa.resample(d, orig_sr=48000, target_sr=16000) for d in vl_data]
-    )
+    vl_data = resample_poly(vl_data, up=1, down=3, axis=1)
+
+    # Keep labels as class indices, the target format nn.CrossEntropyLoss takes directly
+    tr_labels = tr_labels.astype(np.int64, copy=False)
+    vl_labels = vl_labels.astype(np.int64, copy=False)
 
-    # One-hot encode labels
-    tr_labels = np.eye(num_vowels)[tr_labels]
-    vl_labels = np.eye(num_vowels)[vl_labels]
+    processed = (tr_data, tr_labels, vl_data, vl_labels)
 
-    return tr_data, tr_labels.astype("float"), vl_data, vl_labels.astype("float")
+    if use_cache:
+        # Write to a temporary directory first so an interrupted run never leaves a partial cache
+        tmp_dir = f"{cache_dir}.tmp"
+        os.makedirs(tmp_dir, exist_ok=True)
+        for name, array in zip(cache_names, processed):
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), array)
+        os.replace(tmp_dir, cache_dir)
+
+    return processed
+
+
+# Activation layer for each activation name a genome may use
+ACTIVATION_LAYERS = {
+    "relu": nn.ReLU,
+    "leaky_relu": nn.LeakyReLU,
+    "sigmoid": nn.Sigmoid,
+    "tanh": nn.Tanh,
+    "softmax": lambda: nn.Softmax(dim=-1),
+}
 
 
 class Net(nn.Module):
@@ -115,8 +225,8 @@ class Net(nn.Module):
 
     Parameters:
     - genome (list of dicts): Specifies the architecture of the neural network. Each dictionary in the list
-      represents a layer in the network and should include keys for 'num_neurons' (int), 'activation' (str),
-      and optionally 'dropout_rate' (float).
+      represents a layer in the network and should include keys for 'num_neurons' (int), 'activation' (str,
+      a key of `ACTIVATION_LAYERS`), and optionally 'dropout_rate' (float).
     - D (int): The dimensionality of the input data. Defaults to 3.
     - K (int): The number of output classes. Defaults to 4.
 
@@ -132,14 +242,7 @@ class Net(nn.Module):
         # Hidden layers
         for gene in genome:
             layers.append(nn.Linear(input_features, gene["num_neurons"]))
-            if gene["activation"] == "relu":
-                layers.append(nn.ReLU())
-            elif gene["activation"] == "leaky_relu":
-                layers.append(nn.LeakyReLU())
-            elif gene["activation"] == "sigmoid":
-                layers.append(nn.Sigmoid())
-            elif gene["activation"] == "tanh":
-                layers.append(nn.Tanh())
+            layers.append(ACTIVATION_LAYERS[gene["activation"]]())
             if gene["dropout_rate"]:
                 layers.append(nn.Dropout(gene["dropout_rate"]))
             input_features = gene["num_neurons"]
@@ -162,6 +265,37 @@ class Net(nn.Module):
         """
         return self.network(x)
 
+    def without_dropout(self):
+        """
+        Returns an inference-only view of the network with its dropout layers removed.
+
+        Dropout is the identity in evaluation mode, so skipping the layers changes no outputs but saves their
+        dispatch overhead. The returned module shares its parameters with this network.
+
+        Returns:
+        - nn.Sequential: The network's layers without the `nn.Dropout` modules.
+        """
+        return nn.Sequential(
+            *(layer for layer in self.network if not isinstance(layer, nn.Dropout))
+        ).eval()
+
+
+def genome_key(genome):
+    """
+    Returns a canonical string for a genome, used to look up its fitness in `fitness_cache`.
+
+    Parameters:
+    - genome (list of dicts): The genome to serialise.
+
+    Returns:
+    - str: The JSON serialisation of the genome with sorted keys.
+    """
+    return json.dumps(genome, sort_keys=True)
+
+
+# Per-layer fields of the structure-of-arrays population; each is also the blueprint key listing its choices
+GENE_FIELDS = ("neurons", "activations", "dropout")
+
 
 def generate_initial_population(size, blueprint):
     """
@@ -170,11 +304,15 @@ def generate_initial_population(size, blueprint):
     Each individual in the population (or 'genome') consists of a randomly constructed neural network architecture.
     The architecture is determined by randomly selecting from possible configurations specified in the blueprint.
 
+    The population is stored as a structure of arrays rather than a list of genomes, so the genetic operators
+    below act on all individuals at once with NumPy. Every layer setting is encoded as an index into the
+    matching blueprint list; use `decode_genome` to obtain an individual's list-of-dicts genome.
+
     Parameters:
     - size (int): The number of neural network architectures to generate in the population.
     - blueprint (dict): A dictionary specifying the possible configurations for neural network layers.
       The blueprint can contain keys such as:
-      - 'n_layers' (int): The number of layers to include in each network architecture.
+      - 'max_n_layers' (int): The maximum number of layers to include in each network architecture.
       - 'neurons' (list): Possible numbers of neurons per layer.
       - 'activations' (list): Possible activation functions.
       - 'dropout' (list): Possible dropout rates, including None if dropout is not to be applied.
@@ -182,30 +320,48 @@ def generate_initial_population(size, blueprint):
       Each layer in a generated architecture randomly selects from these lists, promoting a diverse initial population.
 
     Returns:
-    - population (list of list of dicts): A list of neural network architectures, where each architecture
-      is represented as a list of dictionaries. Each dictionary defines the configuration of one layer.
+    - population (dict of np.arrays): 'length' (size,) holds the number of layers of each individual, and
+      'neurons', 'activations' and 'dropout' (size, max_n_layers) hold the blueprint index of each layer's
+      setting. Entries past an individual's length are unused.
 
     Example:
     >>> population = generate_initial_population(10, blueprint)
-    >>> len(population)
+    >>> len(population["length"])
     10
     """
+    max_n_layers = blueprint["max_n_layers"]
+    population = {
+        "length": np.random.randint(1, max_n_layers + 1, size=size).astype(np.int8)
+    }
+    for field in GENE_FIELDS:
+        population[field] = np.random.randint(
+            len(blueprint[field]), size=(size, max_n_layers)
+        ).astype(np.int8)
 
-    population = []
+    return population
 
-    for _ in range(size):
-        genome = []
-        n_layers = random.randint(1, blueprint["max_n_layers"])
-        for _ in range(n_layers):
-            gene = {
-                "num_neurons": random.choice(blueprint["neurons"]),
-                "activation": random.choice(blueprint["activations"]),
-                "dropout_rate": random.choice(blueprint["dropout"]),
-            }
-            genome.append(gene)
-        population.append(genome)
 
-    return population
+def decode_genome(population, idx, blueprint):
+    """
+    Decodes one individual of a structure-of-arrays population into its genome.
+
+    Parameters:
+    - population (dict of np.arrays): The population, as returned by `generate_initial_population`.
+    - idx (int): The index of the individual.
+    - blueprint (dict): The blueprint the population was encoded against.
+
+    Returns:
+    - list of dicts: The genome, one dictionary per layer with the keys 'num_neurons', 'activation'
+      and 'dropout_rate'.
+    """
+    return [
+        {
+            "num_neurons": blueprint["neurons"][population["neurons"][idx, layer]],
+            "activation": blueprint["activations"][population["activations"][idx, layer]],
+            "dropout_rate": blueprint["dropout"][population["dropout"][idx, layer]],
+        }
+        for layer in range(population["length"][idx])
+    ]
 
 
 def selection(population, fitnesses, num_parents):
@@ -217,129 +373,336 @@ def selection(population, fitnesses, num_parents):
     with higher fitness have a higher probability of reproducing and passing on their genes.
 
     Parameters:
-    - population (list of list of dicts): The population from which to select top individuals. Each individual
-      in the population is represented as a genome, which is a list of dictionaries where each dictionary
-      details the configuration of a neural network layer.
+    - population (dict of np.arrays): The population from which to select top individuals, as returned by
+      `generate_initial_population`.
     - fitnesses (list of floats): A list of fitness scores corresponding to each individual in the population.
       Each fitness score should be a float indicating the performance of the associated individual.
     - num_parents (int): The number of top-performing individuals to select for the next generation.
 
     Returns:
-    - list of list of dicts: A list containing the genomes of the top-performing individuals selected from the
-      population.
+    - dict of np.arrays: A population containing the top-performing individuals, best first. Ties keep
+      their original order.
 
     Example:
-    >>> population = [[{'num_neurons': 32, 'activation': 'relu'}], [{'num_neurons': 16, 'activation': 'sigmoid'}]]
     >>> fitnesses = [0.95, 0.88]
-    >>> selected = selection(population, fitnesses, 1)
-    >>> len(selected)
+    >>> selected = selection(generate_initial_population(2, blueprint), fitnesses, 1)
+    >>> len(selected["length"])
     1
     """
-    sorted_population = [
-        individual
-        for _, individual in sorted(
-            zip(fitnesses, population), key=lambda x: x[0], reverse=True
+    order = np.argsort(-np.asarray(fitnesses), kind="stable")[:num_parents]
+    return {key: values[order] for key, values in population.items()}
+
+
+def crossover(parents, idx1, idx2):
+    """
+    Combines pairs of parent genomes to create new child genomes through a crossover process.
+
+    Parameters:
+    - parents (dict of np.arrays): The population holding the parents.
+    - idx1 (np.array of ints): For each child, the index of its first parent.
+    - idx2 (np.array of ints): For each child, the index of its second parent.
+
+    Returns:
+    - dict of np.arrays: The children, formed by combining genes from their two parents. A child has as
+      many layers as its shorter parent.
+    """
+    # uniform crossover: every setting of every layer comes from either parent
+    children = {"length": np.minimum(parents["length"][idx1], parents["length"][idx2])}
+    for field in GENE_FIELDS:
+        from_first = np.random.random(parents[field][idx1].shape) < 0.5
+        children[field] = np.where(
+            from_first, parents[field][idx1], parents[field][idx2]
         )
-    ]
-    return sorted_population[:num_parents]
+    return children
 
 
-def crossover(parent1, parent2):
+def mutate(population, blueprint, mutation_rate=0.1):
     """
-    Combines two parent genomes to create a new child genome through a crossover process.
+    Introduces random changes to the genomes of a population based on a specified mutation approach.
+
+    Each layer is mutated with probability `mutation_rate`; a mutated layer re-draws all of its settings
+    from the blueprint.
 
     Parameters:
-    - parent1 (list of dicts): The genome of the first parent.
-    - parent2 (list of dicts): The genome of the second parent.
+    - population (dict of np.arrays): The population to be mutated.
+    - blueprint (dict): The blueprint the population was encoded against.
+    - mutation_rate (float): The probability of mutating each layer.
 
     Returns:
-    - list of dicts: The genome of the child, formed by combining genes from the two parents.
-    """
-    child = []
-    # uniform crossover
-    for gene1, gene2 in zip(parent1, parent2):
-        child_gene = {}
-        for key in gene1:
-            if random.choice([True, False]):
-                child_gene[key] = gene1[key]
-            else:
-                child_gene[key] = gene2[key]
-        child.append(child_gene)
-    return child
+    - dict of np.arrays: The mutated population.
+    """
+    mutated = np.random.random(population["neurons"].shape) < mutation_rate
+    mutants = {"length": population["length"]}
+    for field in GENE_FIELDS:
+        redrawn = np.random.randint(len(blueprint[field]), size=mutated.shape)
+        mutants[field] = np.where(mutated, redrawn, population[field]).astype(np.int8)
+    return mutants
 
 
-def mutate(genome):
+def predict_final_accuracy(history):
     """
-    Introduces random changes to a genome based on a specified mutation approach.
+    Extrapolates a learning curve to estimate the accuracy a network would plateau at.
+
+    Fits `a - b * exp(-c * t)` to the per-epoch validation accuracies (Baker et al.-style learning curve
+    extrapolation) and returns the asymptote `a`.
 
     Parameters:
-    - genome (list of dicts): The genome to be mutated.
+    - history (list of floats): Validation accuracy after each epoch trained so far.
 
     Returns:
-    - list of dicts: The mutated genome.
+    - float: The predicted final accuracy, or `inf` if the curve could not be fitted.
     """
-    mutation_rate = 0.1
-    for gene in genome:
+    epochs = np.arange(1, len(history) + 1)
+    last = min(max(history[-1], 0.0), 1.0)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", OptimizeWarning)
+            (plateau, _, _), _ = curve_fit(
+                lambda t, a, b, c: a - b * np.exp(-c * t),
+                epochs,
+                history,
+                p0=(last, last - history[0], 1.0),
+                bounds=([0.0, -1.0, 0.0], [1.0, 1.0, 10.0]),
+            )
+    except (RuntimeError, ValueError):
+        return float("inf")
+    return plateau
+
+
+class CUDAGraphTrainStep:
+    """
+    Runs the training steps of a model by replaying a single captured CUDA graph.
+
+    The forward pass, loss, backward pass and optimizer update of one step are recorded once and then replayed
+    for every batch, so each step costs a single graph launch instead of one launch per kernel. The first
+    `warmup_steps` calls run eagerly on a side stream, as CUDA graph capture requires (this also compiles
+    `torch.compile`d models and allocates the optimizer state); the next call captures the graph on the same
+    stream. Capture only checks the calling thread, so steps of other genomes may run in other threads.
+
+    All batches must have the same shape, and the optimizer must be created with `capturable=True`.
+
+    Parameters:
+    - model (nn.Module): The model to train, already on the GPU.
+    - loss_fn (callable): Maps the model's output and the targets to the scalar loss.
+    - optimizer (optim.Optimizer): The optimizer updating the model's parameters.
+    - warmup_steps (int): The number of eager steps before capturing. Defaults to 3.
+    """
+
+    def __init__(self, model, loss_fn, optimizer, warmup_steps=3):
+        self.model = model
+        self.loss_fn = loss_fn
+        self.optimizer = optimizer
+        self.warmup_steps = warmup_steps
+        self.side_stream = torch.cuda.Stream()
+        self.graph = None
+
+    def step(self, data, target):
         """
-        each gene is a dictionary with the following keys
-        - num_neurons: int
-        - activation: str
-        - dropout_rate: float
+        Runs one eager training step and returns its detached loss.
         """
-        if random.random() < mutation_rate:
-            for key, _ in gene.items():
-                if key == "num_neurons":
-                    gene[key] = random.choice([4, 8, 16, 32])
-                elif key == "activation":
-                    gene[key] = random.choice(["relu", "sigmoid", "tanh", "softmax"])
-                elif key == "dropout_rate":
-                    gene[key] = random.choice([None, 0.1, 0.2, 0.3])
-    return genome
+        output = self.model(data)
+        loss = self.loss_fn(output, target)
+        loss.backward()
+        self.optimizer.step()
+        return loss.detach()
+
+    def __call__(self, data, target):
+        """
+        Trains on one batch and returns its loss. The returned tensor is overwritten by the next replay.
+        """
+        if self.graph is None and self.warmup_steps > 0:
+            self.warmup_steps -= 1
+            self.side_stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(self.side_stream):
+                self.optimizer.zero_grad(set_to_none=True)
+                loss = self.step(data, target)
+            torch.cuda.current_stream().wait_stream(self.side_stream)
+            return loss
+
+        if self.graph is None:
+            # Capture records the work without running it; the replay below performs this batch's step.
+            # Gradients are unset at capture, so each replay writes them afresh instead of accumulating.
+            self.static_data, self.static_target = data.clone(), target.clone()
+            self.optimizer.zero_grad(set_to_none=True)
+            self.graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(
+                self.graph, stream=self.side_stream, capture_error_mode="thread_local"
+            ):
+                self.static_loss = self.step(self.static_data, self.static_target)
+
+        self.static_data.copy_(data, non_blocking=True)
+        self.static_target.copy_(target, non_blocking=True)
+        self.graph.replay()
+        return self.static_loss
+
+
+def iterate_batches(data, targets, batch_size, shuffle=False, drop_last=False):
+    """
+    Yields mini-batches from tensors that already reside on the training device.
+
+    Shuffling draws a single `torch.randperm` permutation per epoch and gathers each batch from it, so no
+    shuffled copy of the dataset is made; unshuffled batches are contiguous slices. Either way, the per-sample
+    indexing and collation of a `DataLoader` is avoided.
+
+    Parameters:
+    - data (Tensor): The (N, D) inputs.
+    - targets (Tensor): The N matching targets.
+    - batch_size (int): The number of samples per batch.
+    - shuffle (bool): Whether to visit the samples in a new random order.
+    - drop_last (bool): Whether to skip the final, smaller batch so all batches share one shape.
+
+    Yields:
+    - tuple of Tensors: The (data, targets) of each batch.
+    """
+    permutation = torch.randperm(len(data), device=data.device) if shuffle else None
+    stop = len(data) - len(data) % batch_size if drop_last else len(data)
+    for start in range(0, stop, batch_size):
+        if permutation is not None:
+            idx = permutation[start : start + batch_size]
+            yield data[idx], targets[idx]
+        else:
+            yield data[start : start + batch_size], targets[start : start + batch_size]
+
+
+def evaluate_accuracy(model, test_set, batch_size, device="cpu"):
+    """
+    Counts the correct predictions of a model on a dataset.
+
+    Parameters:
+    - model (nn.Module): The model to evaluate. It is switched to evaluation mode.
+    - test_set (tuple of Tensors): The (data, targets) pair to evaluate on, residing on `device`.
+    - batch_size (int): The number of samples per evaluation batch.
+    - device (str or torch.device): The device the model and `test_set` reside on. Defaults to "cpu".
+
+    Returns:
+    - int: The number of correct predictions.
+    - int: The number of evaluated samples.
+    """
+    model.eval()
+    correct = torch.zeros((), dtype=torch.long, device=device)
+    total = 0
+    with torch.inference_mode():
+        for data, target in iterate_batches(*test_set, batch_size):
+            output = model(data)
+            pred = output.argmax(dim=1)
+            correct += pred.eq(target).sum()
+            total += target.size(0)
+    return int(correct), total
 
 
 def compute_fitness(
-    genome, train_loader, test_loader, criterion, lr=0.01, epochs=5, D=None, K=None
+    genome,
+    train_set,
+    test_set,
+    criterion,
+    batch_size=16,
+    lr=0.01,
+    epochs=5,
+    D=None,
+    K=None,
+    device="cpu",
+    best_fitness=None,
+    min_epochs=3,
+    compile_model=False,
+    cuda_graph=False,
+    reset_compiler=True,
 ):
+    """
+    Trains the network described by a genome and returns its validation accuracy.
+
+    `train_set` and `test_set` are (data, targets) tensor pairs residing on `device`.
+
+    The validation accuracy is tracked after every epoch. Once `min_epochs` epochs have been trained, training
+    stops early if the extrapolated final accuracy falls below `best_fitness`, since such a genome would not
+    be selected anyway.
+
+    With `cuda_graph`, training steps are replayed from a captured CUDA graph (see `CUDAGraphTrainStep`).
+
+    Parameters:
+    - genome (list of dicts): The architecture of the network to train, as accepted by `Net`.
+    - train_set (tuple of Tensors): The (data, targets) pair to train on.
+    - test_set (tuple of Tensors): The (data, targets) pair the accuracy is measured on.
+    - criterion (callable): The loss function, mapping the network's output and the targets to a scalar.
+    - batch_size (int): The number of samples per batch. Defaults to 16.
+    - lr (float): The learning rate of the Adam optimizer. Defaults to 0.01.
+    - epochs (int): The maximum number of training epochs. Defaults to 5.
+    - D (int): The dimensionality of the input data.
+    - K (int): The number of output classes.
+    - device (str or torch.device): The device to train on. Defaults to "cpu".
+    - best_fitness (float or None): The fitness a genome must be predicted to reach to keep training. None
+      disables early stopping. Defaults to None.
+    - min_epochs (int): The number of epochs trained before early stopping is considered. Defaults to 3.
+    - compile_model (bool): Whether to compile the network with `torch.compile`. Defaults to False.
+    - cuda_graph (bool): Whether to replay the training steps from a captured CUDA graph; requires a CUDA
+      `device`. Defaults to False.
+    - reset_compiler (bool): Whether to clear the compile caches before compiling; pass False while other
+      threads run compiled networks, and reset between batches of genomes instead. Defaults to True.
+
+    Returns:
+    - float: The accuracy of the genome after its last trained epoch.
+    """
+    if cuda_graph and torch.device(device).type != "cuda":
+        raise ValueError("cuda_graph requires a CUDA device")
+
     # Create the model from the genome
-    model = Net(genome, D, K)
+    model = Net(genome, D, K).to(device)
+    if compile_model:
+        # Every genome is a new model whose code Dynamo would otherwise add to the guards of the previous
+        # ones, until the recompile limit is hit and later genomes silently run eagerly; start afresh
+        if reset_compiler:
+            torch.compiler.reset()
+        # shapes are fixed per genome (full batches only), so specialise on them
+        model = torch.compile(model, dynamic=False)
 
     # optimizer to train the models
-    optimizer = optim.Adam(model.parameters(), lr=lr)
+    optimizer = optim.Adam(model.parameters(), lr=lr, capturable=cuda_graph)
+    train_step = CUDAGraphTrainStep(model, criterion, optimizer) if cuda_graph else None
 
     # Train the model
-    model.train()
     total_loss = 0
-    total_batches = len(train_loader)
+    # at least one, so a training set smaller than a batch reports a zero loss instead of dividing by zero
+    total_batches = max(1, len(train_set[0]) // batch_size)
+    history = []
     for epoch in range(epochs):
+        model.train()
         epoch_loss = 0
-        for batch_idx, (data, target) in enumerate(train_loader):
-            optimizer.zero_grad()
-            output = model(data)
-            loss = criterion(output, target)
-            loss.backward()
-            optimizer.step()
-            epoch_loss += loss.item()
-
-        average_epoch_loss = epoch_loss / total_batches
+        # full batches only, so every step has the same shape
+        batches = iterate_batches(*train_set, batch_size, shuffle=True, drop_last=True)
+        for batch_idx, (data, target) in enumerate(batches):
+            if train_step is not None:
+                loss = train_step(data, target)
+            else:
+                optimizer.zero_grad()
+                output = model(data)
+                loss = criterion(output, target)
+                loss.backward()
+                optimizer.step()
+            epoch_loss += loss.detach()
+
+        average_epoch_loss = float(epoch_loss) / total_batches
         print(
             f"Epoch {epoch + 1}/{epochs} complete. Average Training Loss: {average_epoch_loss:.4f}"
         )
         total_loss += epoch_loss
 
-    print("Training complete.")
+        # Track the validation accuracy to extrapolate the learning curve
+        correct, total = evaluate_accuracy(model, test_set, batch_size, device)
+        history.append(correct / total)
+        if (
+            best_fitness is not None
+            and min_epochs <= epoch + 1 < epochs
+            and predict_final_accuracy(history) < best_fitness
+        ):
+            print(
+                f"Stopping early: predicted accuracy is below the best fitness {best_fitness:.4f}."
+            )
+            break
 
-    # Evaluate the model
-    model.eval()
-    correct = 0
-    total = 0
-    with torch.no_grad():
-        for data, target in test_loader:
-            output = model(data)
-            pred = output.argmax(dim=1, keepdim=True)
-            target = target.argmax(dim=1, keepdim=True)
-            correct += pred.eq(target).sum().item()
-            total += target.size(0)
+    print("Training complete.")
 
+    # Report the accuracy reached after the last trained epoch (or of the untrained model if `epochs` is 0)
+    if not history:
+        correct, total = evaluate_accuracy(model, test_set, batch_size, device)
     accuracy = correct / total
     print(
         f"Evaluation complete. Accuracy: {accuracy:.4f} ({correct}/{total} correct)\n"
@@ -348,146 +711,337 @@ def compute_fitness(
     return accuracy
 
 
-# Load and process the PCVC dataset into training and validation sets.
-# This function will split the raw data, apply preprocessing like windowing and resampling,
-# and return processed training data (X, labels) and validation data (X_val, labels_val).
-X, labels, X_val, labels_val = load_and_process_pcvc_data()
-# Determine the number of samples and classes from the shape of the training data and labels.
-# This will help in setting up the network architecture later.
-Nsamps, Nclasses = X.shape[-1], labels.shape[-1]
-# Convert numpy arrays to PyTorch tensors. Tensors are a type of data structure used in PyTorch
-# that are similar to arrays.
-X_tensor, X_val_tensor = torch.FloatTensor(X), torch.FloatTensor(X_val)
-y_tensor, y_val_tensor = torch.FloatTensor(labels), torch.FloatTensor(labels_val)
-# Wrap tensors in a TensorDataset, which provides a way to access slices of tensors
-# using indexing that is useful during training because it abstracts away the data handling.
-dataset = TensorDataset(X_tensor, y_tensor)
-dataset_val = TensorDataset(X_val_tensor, y_val_tensor)
-# DataLoader is used to efficiently load data in batches, which is necessary for training neural networks.
-# `shuffle=True` ensures that the data is shuffled at every epoch to prevent the model from learning
-# any order-based biases in the dataset.
-train_loader = DataLoader(dataset, batch_size=BATCH_SIZE, shuffle=True)
-val_loader = DataLoader(dataset_val, batch_size=BATCH_SIZE, shuffle=False)
-
-
-blueprint = {
-    "max_n_layers": 5,  # Define the (maximum) number of layers in each neural network
-    "neurons": [4, 8, 16, 32, 64, 128, 256],  # Possible neuron counts per layer
-    "activations": ["relu", "leaky_relu", "sigmoid", "tanh"],
-    "dropout": [None, 0.1, 0.2, 0.3, 0.4, 0.5],
-}
+def load_datasets():
+    """
+    Loads the processed PCVC dataset as tensors on the training device.
+
+    Returns:
+    - tuple of Tensors: The (data, targets) training set.
+    - tuple of Tensors: The (data, targets) validation set.
+    """
+    # Load and process the PCVC dataset into training and validation sets.
+    # This function will split the raw data, apply preprocessing like windowing and resampling,
+    # and return processed training data (X, labels) and validation data (X_val, labels_val).
+    X, labels, X_val, labels_val = load_and_process_pcvc_data()
+    # Convert numpy arrays to PyTorch tensors. Tensors are a type of data structure used in PyTorch
+    # that are similar to arrays. The arrays are already float32, so `torch.from_numpy` wraps their
+    # buffers (including the memory-mapped cache) without copying. The whole dataset fits in memory, so it
+    # is moved to the training device once (a no-op on the CPU) and batched by slicing (see `iterate_batches`).
+    X_tensor, X_val_tensor = torch.from_numpy(X), torch.from_numpy(X_val)
+    y_tensor, y_val_tensor = torch.from_numpy(labels), torch.from_numpy(labels_val)
+    return (X_tensor.to(device), y_tensor.to(device)), (
+        X_val_tensor.to(device),
+        y_val_tensor.to(device),
+    )
+
+
+# Datasets of a fitness worker process, loaded once by `init_fitness_worker`
+worker_datasets = ()
+
+
+def init_fitness_worker(num_threads):
+    """
+    Prepares a worker process of the fitness pool.
+
+    The datasets are loaded from the on-disk cache written by the main process, and the number of intra-op
+    threads is limited so the workers do not oversubscribe the CPU cores.
+
+    Parameters:
+    - num_threads (int): The number of threads PyTorch may use in this worker.
+    """
+    global worker_datasets
+    torch.set_num_threads(num_threads)
+    worker_datasets = load_datasets()
+
+
+def compute_fitness_in_worker(genome, **kwargs):
+    """
+    Runs `compute_fitness` in a fitness worker process on the datasets loaded by `init_fitness_worker`.
+
+    Parameters:
+    - genome (list of dicts): The architecture of the network to train.
+    - **kwargs: The remaining keyword arguments of `compute_fitness`.
+
+    Returns:
+    - float: The accuracy of the genome, as returned by `compute_fitness`.
+    """
+    return compute_fitness(genome, *worker_datasets, **kwargs)
+
+
+# The CUDA stream of each fitness thread, created by `init_stream_worker`
+stream_worker = threading.local()
+
+
+def init_stream_worker(recompile_limit):
+    """
+    Prepares a thread of the GPU fitness pool.
+
+    Each thread gets its own CUDA stream. The compile caches are shared by all threads and only reset once
+    per generation, so the thread's recompile limit (a per-thread setting) must leave room for the networks
+    of a whole generation.
+
+    Parameters:
+    - recompile_limit (int): The number of compiled versions of a network's forward kept before Dynamo falls
+      back to running it eagerly.
+    """
+    stream_worker.stream = torch.cuda.Stream()
+    torch._dynamo.config.recompile_limit = recompile_limit
+
+
+def compute_fitness_on_stream(genome, *args, **kwargs):
+    """
+    Runs `compute_fitness` in a fitness thread, issuing all of its GPU work on the thread's own CUDA stream.
+
+    Genomes trained by different threads thus run concurrently on the device instead of being serialised on
+    the default stream, and each genome's steps still execute in order on its stream.
+
+    Parameters:
+    - genome (list of dicts): The architecture of the network to train.
+    - *args, **kwargs: The remaining arguments of `compute_fitness`.
+
+    Returns:
+    - float: The accuracy of the genome, as returned by `compute_fitness`.
+    """
+    # the datasets were moved to the device on the default stream
+    stream_worker.stream.wait_stream(torch.cuda.default_stream())
+    with torch.cuda.stream(stream_worker.stream):
+        return compute_fitness(genome, *args, **kwargs)
+
+
+def main():
+    """
+    Runs the genetic algorithm on the PCVC dataset and re-trains the best architecture found.
 
-population = generate_initial_population(population_size, blueprint)
-
-# Initialize best performance tracking
-best_overall_fitness = float("-inf")
-best_overall_architecture = None
-
-for generation in range(num_generations):
-    # Evaluate fitnesses
-    fitnesses = []
-    total_genomes = len(population)
-    for idx, genome in enumerate(population):
-        # Compute the fitness for each genome
-        fitness = compute_fitness(
-            genome,
-            train_loader,
-            val_loader,
-            nn.CrossEntropyLoss(),
+    Kept behind a `__main__` guard so worker processes can import this module without re-running the search.
+    """
+    train_set, val_set = load_datasets()
+    print(f"Training on device: {device}")
+    # Determine the number of samples and classes from the training data and its class indices.
+    # This will help in setting up the network architecture later.
+    Nsamps, Nclasses = train_set[0].shape[-1], int(train_set[1].max()) + 1
+
+    # Genomes are trained independently. On the GPU they are trained by a pool of threads, each on its own
+    # CUDA stream, with room for the training and evaluation graphs of every genome of a generation in the
+    # shared compile caches. On the CPU they are trained in a pool of worker processes. "spawn" avoids
+    # forking a process whose PyTorch thread pools are already running.
+    executor = None
+    if FITNESS_WORKERS > 1 and device.type == "cuda":
+        executor = ThreadPoolExecutor(
+            max_workers=FITNESS_WORKERS,
+            initializer=init_stream_worker,
+            initargs=(max(torch._dynamo.config.recompile_limit, 2 * population_size),),
+        )
+    elif FITNESS_WORKERS > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=FITNESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_fitness_worker,
+            initargs=(max(1, (os.cpu_count() or 1) // FITNESS_WORKERS),),
+        )
+
+    blueprint = {
+        "max_n_layers": 5,  # Define the (maximum) number of layers in each neural network
+        "neurons": [4, 8, 16, 32, 64, 128, 256],  # Possible neuron counts per layer
+        "activations": ["relu", "leaky_relu", "sigmoid", "tanh"],
+        "dropout": [None, 0.1, 0.2, 0.3, 0.4, 0.5],
+    }
+
+    population = generate_initial_population(population_size, blueprint)
+
+    # Initialize best performance tracking
+    best_overall_fitness = float("-inf")
+    best_overall_architecture = None
+
+    for generation in range(num_generations):
+        # Decode the population into genomes to build and train the networks
+        genomes = [
+            decode_genome(population, idx, blueprint)
+            for idx in range(len(population["length"]))
+        ]
+
+        # Collect the distinct genomes that have not been evaluated yet
+        pending = {}
+        for genome in genomes:
+            key = genome_key(genome)
+            if key not in fitness_cache:
+                pending.setdefault(key, genome)
+
+        fitness_kwargs = dict(
+            criterion=nn.CrossEntropyLoss(),
+            batch_size=BATCH_SIZE,
             lr=LR,
             epochs=EPOCHS,
             D=Nsamps,
             K=Nclasses,
+            device=device,
+            compile_model=COMPILE_MODELS,
+            cuda_graph=CUDA_GRAPHS,
         )
-        fitnesses.append(fitness)
+        if executor is not None and device.type == "cuda":
+            # Compute the fitness of all genomes concurrently on their threads' streams; genomes predicted
+            # to stay below the best fitness of the previous generations stop training early
+            if COMPILE_MODELS:
+                torch.compiler.reset()
+            futures = {
+                executor.submit(
+                    compute_fitness_on_stream,
+                    genome,
+                    train_set,
+                    val_set,
+                    best_fitness=best_overall_fitness,
+                    reset_compiler=False,
+                    **fitness_kwargs,
+                ): key
+                for key, genome in pending.items()
+            }
+            for future in as_completed(futures):
+                fitness_cache[futures[future]] = future.result()
+            # Wait for the work of all streams before the next generation
+            torch.cuda.synchronize()
+        elif executor is not None:
+            # Compute the fitness of all genomes in parallel; genomes predicted to stay below the best
+            # fitness of the previous generations stop training early
+            futures = {
+                executor.submit(
+                    compute_fitness_in_worker,
+                    genome,
+                    best_fitness=best_overall_fitness,
+                    **fitness_kwargs,
+                ): key
+                for key, genome in pending.items()
+            }
+            for future in as_completed(futures):
+                fitness_cache[futures[future]] = future.result()
+        else:
+            # Best fitness seen so far; genomes predicted to stay below it stop training early
+            best_fitness_so_far = best_overall_fitness
+            for key, genome in pending.items():
+                # Compute the fitness for each genome
+                fitness = compute_fitness(
+                    genome,
+                    train_set,
+                    val_set,
+                    best_fitness=best_fitness_so_far,
+                    **fitness_kwargs,
+                )
+                fitness_cache[key] = fitness
+                best_fitness_so_far = max(best_fitness_so_far, fitness)
+
+        # Evaluate fitnesses
+        fitnesses = [fitness_cache[genome_key(genome)] for genome in genomes]
+        total_genomes = len(genomes)
+        for idx, fitness in enumerate(fitnesses):
+            print(
+                f'Genome {idx + 1}/{total_genomes} evaluated. "Fitness" (i.e. accuracy): {fitness:.4f}.'
+            )
+        print(f"All genomes in generation {generation} have been evaluated.")
+
+        parents = selection(population, fitnesses, num_parents)
+
+        # Track the best architecture in this generation
+        max_fitness_idx = fitnesses.index(max(fitnesses))
+        best_fitness_this_gen = fitnesses[max_fitness_idx]
+        best_architecture_this_gen = genomes[max_fitness_idx]
+
+        # Update overall best if the current gen has a new best
+        if best_fitness_this_gen > best_overall_fitness:
+            best_overall_fitness = best_fitness_this_gen
+            best_overall_architecture = best_architecture_this_gen
+
+        print(f"Generation {generation + 1}, Best Fitness: {best_fitness_this_gen}")
+        print("Best Architecture:", best_architecture_this_gen, "\n")
+
+        # Generate next generation: the parents plus children of two distinct, randomly paired parents
+        num_children = population_size - num_parents
+        pairs = np.argsort(np.random.random((num_children, num_parents)), axis=1)[:, :2]
+        children = mutate(crossover(parents, pairs[:, 0], pairs[:, 1]), blueprint)
+        population = {
+            key: np.concatenate([parents[key], children[key]]) for key in parents
+        }
+
+    if executor is not None:
+        executor.shutdown()
+
+    # Final summary at the end of all generations
+    print("\nFinal Summary")
+    print("Best Overall Fitness:", best_overall_fitness)
+    print("Best Overall Architecture:", best_overall_architecture)
+
+    # Inform about the beginning of the re-training process
+    print(
+        "\nStarting the re-training of the best model found by the genetic algorithm (corroborate reproducibility)"
+    )
+
+    # Re-build the best model based on the architecture determined to be most effective during the genetic algorithm.
+    # This model is built from scratch using the best configuration parameters (genome) found.
+    best_model = Net(best_overall_architecture, D=Nsamps, K=Nclasses).to(device)
+    # The compiled wrapper shares its parameters with `best_model`, which is kept for saving the weights.
+    best_model_forward = (
+        torch.compile(best_model, dynamic=False) if COMPILE_MODELS else best_model
+    )
+
+    # Set up the loss function and the optimizer. The optimizer is configured to optimize the weights of our neural network,
+    # and the learning rate is set as per earlier specification.
+    best_model_criterion = nn.CrossEntropyLoss()
+    best_model_optimizer = optim.Adam(
+        best_model.parameters(), lr=LR, capturable=CUDA_GRAPHS
+    )
+    # With CUDA_GRAPHS, each training step is replayed from a captured CUDA graph.
+    best_model_train_step = (
+        CUDAGraphTrainStep(best_model_forward, best_model_criterion, best_model_optimizer)
+        if CUDA_GRAPHS
+        else None
+    )
+
+    # Training loop: This process involves multiple epochs where each epoch goes through the entire training dataset.
+    for epoch in range(EPOCHS):
+        best_model.train()  # Set the model to training mode
+        total_loss = 0
+        total_batches = max(1, len(train_set[0]) // BATCH_SIZE)
+
+        # Process each batch of data, reshuffled every epoch
+        batches = iterate_batches(*train_set, BATCH_SIZE, shuffle=True, drop_last=True)
+        for batch_idx, (data, target) in enumerate(batches):
+            if best_model_train_step is not None:
+                loss = best_model_train_step(data, target)  # Replay the captured step
+            else:
+                best_model_optimizer.zero_grad()  # Clear previous gradients
+                output = best_model_forward(data)  # Compute the model's output
+                loss = best_model_criterion(output, target)  # Calculate loss
+                loss.backward()  # Compute gradients
+                best_model_optimizer.step()  # Update weights
+            total_loss += loss.detach()  # Accumulate the loss (on the device, no sync)
+
+        average_epoch_loss = float(total_loss) / total_batches
         print(
-            f'Genome {idx + 1}/{total_genomes} evaluated. "Fitness" (i.e. accuracy): {fitness:.4f}.\n'
+            f"Epoch {epoch + 1}/{EPOCHS} complete. Average Training Loss: {average_epoch_loss:.4f}"
         )
-    print(f"All genomes in generation {generation} have been evaluated.")
-
-    parents = selection(population, fitnesses, num_parents)
-
-    # Track the best architecture in this generation
-    max_fitness_idx = fitnesses.index(max(fitnesses))
-    best_fitness_this_gen = fitnesses[max_fitness_idx]
-    best_architecture_this_gen = population[max_fitness_idx]
-
-    # Update overall best if the current gen has a new best
-    if best_fitness_this_gen > best_overall_fitness:
-        best_overall_fitness = best_fitness_this_gen
-        best_overall_architecture = best_architecture_this_gen
-
-    print(f"Generation {generation + 1}, Best Fitness: {best_fitness_this_gen}")
-    print("Best Architecture:", best_architecture_this_gen, "\n")
-
-    # Generate next generation
-    next_generation = parents[:]
-    while len(next_generation) < population_size:
-        parent1, parent2 = random.sample(parents, 2)
-        child = crossover(parent1, parent2)
-        child = mutate(child)
-        next_generation.append(child)
-    population = next_generation
-
-# Final summary at the end of all generations
-print("\nFinal Summary")
-print("Best Overall Fitness:", best_overall_fitness)
-print("Best Overall Architecture:", best_overall_architecture)
-
-# Inform about the beginning of the re-training process
-print(
-    "\nStarting the re-training of the best model found by the genetic algorithm (corroborate reproducibility)"
-)
-
-# Re-build the best model based on the architecture determined to be most effective during the genetic algorithm.
-# This model is built from scratch using the best configuration parameters (genome) found.
-best_model = Net(best_overall_architecture, D=Nsamps, K=Nclasses)
-
-# Set up the loss function and the optimizer. The optimizer is configured to optimize the weights of our neural network,
-# and the learning rate is set as per earlier specification.
-best_model_criterion = nn.CrossEntropyLoss()
-best_model_optimizer = optim.Adam(best_model.parameters(), lr=LR)
-
-# Training loop: This process involves multiple epochs where each epoch goes through the entire training dataset.
-for epoch in range(EPOCHS):
-    best_model.train()  # Set the model to training mode
-    total_loss = 0
-    total_batches = len(train_loader)
-
-    # Process each batch of data
-    for batch_idx, (data, target) in enumerate(train_loader):
-        best_model_optimizer.zero_grad()  # Clear previous gradients
-        output = best_model(data)  # Compute the model's output
-        loss = best_model_criterion(output, target)  # Calculate loss
-        loss.backward()  # Compute gradients
-        best_model_optimizer.step()  # Update weights
-        total_loss += loss.item()  # Accumulate the loss
-
-    average_epoch_loss = total_loss / total_batches
+
+    # After training, switch to evaluation mode for testing, using a view of the model without dropout layers.
+    best_model.eval()
+    best_model_deployed = best_model.without_dropout()
+    correct = 0
+    total = 0
+
+    # Disable gradient tracking for validation (inference mode also skips autograd's version bookkeeping).
+    with torch.inference_mode():
+        # Process each batch from the validation set
+        for data, target in iterate_batches(*val_set, BATCH_SIZE):
+            output = best_model_deployed(data)  # Compute the model's output
+            pred = output.argmax(dim=1)  # Find the predicted class
+            correct += pred.eq(target).sum()  # Count correct predictions
+            total += target.size(0)  # Total number of items
+
+    correct = int(correct)  # Single device-to-host read of the count
+    validation_accuracy = correct / total  # Calculate accuracy
     print(
-        f"Epoch {epoch + 1}/{EPOCHS} complete. Average Training Loss: {average_epoch_loss:.4f}"
+        f"Evaluation on validation set complete. Accuracy: {validation_accuracy:.4f} ({correct}/{total} correct)"
     )
 
-# After training, switch to evaluation mode for testing.
-best_model.eval()
-correct = 0
-total = 0
-
-# Disable gradient computation for validation, as it isn't needed and saves memory and computation.
-with torch.no_grad():
-    # Process each batch from the validation set
-    for data, target in val_loader:
-        output = best_model(data)  # Compute the model's output
-        pred = output.argmax(dim=1, keepdim=True)  # Find the predicted class
-        target = target.argmax(dim=1, keepdim=True)  # Actual class
-        correct += pred.eq(target).sum().item()  # Count correct predictions
-        total += target.size(0)  # Total number of items
-
-validation_accuracy = correct / total  # Calculate accuracy
-print(
-    f"Evaluation on validation set complete. Accuracy: {validation_accuracy:.4f} ({correct}/{total} correct)"
-)
-
-# Save the trained model's weights for future use.
-torch.save(best_model.state_dict(), "best_net.pth")
-print("Saved the best model's weights to 'best_net.pth'")
+    # Save the trained model's weights for future use (from the CPU, so they load without a GPU).
+    torch.save(best_model.cpu().state_dict(), "best_net.pth")
+    print("Saved the best model's weights to 'best_net.pth'")
+
+
+if __name__ == "__main__":
+    main()